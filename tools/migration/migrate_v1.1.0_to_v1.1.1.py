@@ -10,81 +10,148 @@ Main changes:
 """
 
 import json
+import multiprocessing
+import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 
-def migrate_entry(entry, doc_timestamp):
-    """
-    Migrate a single entry by adding created_at if missing.
-    
-    Args:
-        entry: Entry object to migrate
-        doc_timestamp: Document-level timestamp to use if entry lacks created_at
-    
-    Returns:
-        Modified entry object
-    """
-    if 'created_at' not in entry and doc_timestamp:
-        entry['created_at'] = doc_timestamp
-    return entry
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Time this migration ran, shared by every document migrated in this process
+_MIGRATED_AT = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
 
-def migrate_document(old_doc):
+def migrate_document(doc):
     """
     Migrate a NALT Protocol document from v1.1.0 to v1.1.1.
     
+    The document is migrated in place: the input object and its entries
+    are modified rather than copied, so callers must not reuse it as v1.1.0.
+    
     Args:
-        old_doc: Document object in v1.1.0 format
+        doc: Document object in v1.1.0 format
     
     Returns:
-        Document object in v1.1.1 format
+        The same document object, now in v1.1.1 format
     """
-    new_doc = old_doc.copy()
-    
     # Remove timestamp from top level and store it
-    doc_timestamp = new_doc.pop('timestamp', None)
+    doc_timestamp = doc.pop('timestamp', None)
 
-    # Migrate each entry
-    entries = new_doc.get('entries', [])
-    new_doc['entries'] = [migrate_entry(entry, doc_timestamp) for entry in entries]
+    # Add created_at to entries that lack it, using the removed timestamp
+    entries = doc.get('entries', [])
+    if doc_timestamp:
+        for entry in entries:
+            entry.setdefault('created_at', doc_timestamp)
+    doc['entries'] = entries
 
     # Update version and add migration metadata
-    new_doc['spec_version'] = 'nalt-protocol/1.1.1'
-    new_doc['x_migrated_at'] = datetime.utcnow().isoformat() + 'Z'
+    doc['spec_version'] = 'nalt-protocol/1.1.1'
+    doc['x_migrated_at'] = _MIGRATED_AT
+
+    return doc
+
+def _dumps(doc):
+    """Serialize a document to indented UTF-8 JSON bytes."""
+    if orjson:
+        try:
+            return orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits; stdlib json keeps them
+            pass
+    return json.dumps(doc, indent=2, ensure_ascii=False).encode('utf-8')
 
-    return new_doc
+def _output_path(filename):
+    """Return the path the migrated copy of a file is written to."""
+    return f"migrated_{filename}"
 
-def main(filename):
+def migrate_file(filename):
     """
-    Main migration function.
+    Migrate a single file, writing the result to migrated_<filename>.
     
     Args:
         filename: Path to the JSON file to migrate
+    
+    Returns:
+        Tuple of (success, message to print)
     """
     try:
         with open(filename, 'r', encoding='utf-8') as f:
+            # stdlib json keeps integers of any size; orjson would turn
+            # integers wider than 64 bits into floats
             old_doc = json.load(f)
     except FileNotFoundError:
-        print(f"Error: File '{filename}' not found.")
-        sys.exit(1)
+        return False, f"Error: File '{filename}' not found."
     except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in file '{filename}': {e}")
-        sys.exit(1)
+        return False, f"Error: Invalid JSON in file '{filename}': {e}"
+    except (OSError, ValueError) as e:
+        return False, f"Error: Cannot read file '{filename}': {e}"
     
-    new_doc = migrate_document(old_doc)
+    # Report malformed documents as a failed file instead of raising, so that
+    # one bad file does not abort a batch
+    if not isinstance(old_doc, dict):
+        return False, f"Error: File '{filename}' does not contain a JSON object."
+    try:
+        new_doc = migrate_document(old_doc)
+    except (AttributeError, TypeError) as e:
+        return False, f"Error: Unexpected document structure in file '{filename}': {e}"
 
     # Create output filename
-    new_filename = f"migrated_{filename}"
+    new_filename = _output_path(filename)
     
-    with open(new_filename, 'w', encoding='utf-8') as f:
-        json.dump(new_doc, f, indent=2, ensure_ascii=False)
+    # Serialize in one shot and write the encoded bytes with a single call
+    payload = _dumps(new_doc)
+    try:
+        with open(new_filename, 'wb') as f:
+            f.write(payload)
+    except OSError as e:
+        return False, f"Error: Cannot write output file '{new_filename}': {e}"
     
-    print(f"Migration successful!")
-    print(f"Output file: {new_filename}")
+    return True, f"Migration successful!\nOutput file: {new_filename}"
+
+def main(filenames):
+    """
+    Main migration function.
+    
+    Args:
+        filenames: Paths to the JSON files to migrate. Multiple files are
+            migrated in parallel worker processes.
+    """
+    # Fail every file whose output would collide with another file's output,
+    # instead of letting parallel workers overwrite each other
+    targets = {}
+    for filename in filenames:
+        targets.setdefault(os.path.abspath(_output_path(filename)), []).append(filename)
+    results = [None] * len(filenames)
+    pending = []
+    for i, filename in enumerate(filenames):
+        sources = targets[os.path.abspath(_output_path(filename))]
+        if len(sources) > 1:
+            results[i] = (False, f"Error: Output file '{_output_path(filename)}' would be written for "
+                                 f"more than one input ({', '.join(sources)}); skipping '{filename}'.")
+        else:
+            pending.append(i)
+    
+    if len(pending) == 1:
+        results[pending[0]] = migrate_file(filenames[pending[0]])
+    elif pending:
+        with multiprocessing.Pool() as pool:
+            migrated = pool.map(migrate_file, [filenames[i] for i in pending])
+        for i, result in zip(pending, migrated):
+            results[i] = result
+    
+    failed = False
+    for success, message in results:
+        print(message)
+        failed = failed or not success
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python migrate_v1.1.0_to_v1.1.1.py <filename>")
+    if len(sys.argv) < 2:
+        print("Usage: python migrate_v1.1.0_to_v1.1.1.py <filename> [<filename> ...]")
         print("Example: python migrate_v1.1.0_to_v1.1.1.py old_data.json")
         sys.exit(1)
     
-    main(sys.argv[1])
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
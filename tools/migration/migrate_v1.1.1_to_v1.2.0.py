@@ -5,63 +5,96 @@ Removes non-core fields as part of the slim-core initiative.
 """
 
 import json
+import multiprocessing
 import sys
 import os
-from datetime import datetime
-from copy import deepcopy
+from collections import Counter
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Time this migration ran, shared by every document migrated in this process
+_MIGRATED_AT = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+# Fields removed from the top level, meta and each entry, in reporting order.
+# 'timestamp' should already be gone in v1.1.1, but check anyway.
+_TOP_REMOVE = ('signature', 'timestamp')
+_META_REMOVE = ('x_utc_offset_minutes', 'x_processed_by', 'x_ai_processing',
+                'x_statistics', 'x_migration', 'x_encryption', 'x_merged_from')
+_ENTRY_REMOVE = ('summary', 'moods', 'tags', 'entities', 'end_date',
+                 'created_at', 'x_relations', 'x_due_date')
+
+# Sentinel for dict.pop() so that fields holding null are still reported
+_MISSING = object()
+
+
+def _generate_strip_function(top_fields, meta_fields, entry_fields):
+    """
+    Generate the source of _strip_fields, specialized for the given removal lists.
+    
+    Every field becomes its own unrolled membership test and pop() statement,
+    so removing fields costs no Python-level loop over the lists and no set
+    operations per entry. Entries are only copied when they have a field to remove.
+    """
+    def pops(indent, target, fields, record):
+        return [line
+                for field in fields
+                for line in (f"{indent}if {target}({field!r}, _MISSING) is not _MISSING:",
+                             f"{indent}    {record.format(field=repr(field))}")]
+
+    lines = [
+        "def _strip_fields(old_doc):",
+        "    new_doc = old_doc.copy()",
+        "    top_level = []",
+        "    meta_removed = []",
+        "    entry_counts = {}",
+        "    pop = new_doc.pop",
+        *pops("    ", "pop", top_fields, "top_level.append({field})"),
+        "    if 'meta' in new_doc:",
+        "        meta = new_doc['meta'] = new_doc['meta'].copy()",
+        "        pop = meta.pop",
+        *pops("        ", "pop", meta_fields, "meta_removed.append({field})"),
+        "    if 'entries' in new_doc:",
+        "        new_entries = []",
+        "        append = new_entries.append",
+        "        for entry in new_doc['entries']:",
+        # Entries without removable fields are kept as-is, without a copy
+        "            if " + " or ".join(f"{field!r} in entry" for field in entry_fields) + ":",
+        "                entry = entry.copy()",
+        "                pop = entry.pop",
+        *pops("                ", "pop", entry_fields,
+              "entry_counts[{field}] = entry_counts.get({field}, 0) + 1"),
+        "            append(entry)",
+        "        new_doc['entries'] = new_entries",
+        "    return new_doc, {'top_level': top_level, 'meta': meta_removed,",
+        "                     'entries': Counter(entry_counts)}",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+# Compile the specialized function once, at import time
+exec(_generate_strip_function(_TOP_REMOVE, _META_REMOVE, _ENTRY_REMOVE), globals())
 
 
 def migrate_document(old_doc):
     """
     Migrate a NALT Protocol document from v1.1.1 to v1.2.0.
     Removes all non-core fields to create a slim-core document.
+    
+    The input is not modified: the top level, meta and any entry with fields
+    to remove are shallow-copied first, and other values are shared.
+    removed_fields['entries'] counts the entries each field was removed from.
     """
-    new_doc = deepcopy(old_doc)
-    removed_fields = {
-        'top_level': [],
-        'meta': [],
-        'entries': {}
-    }
-    
-    # Remove top-level fields
-    if 'signature' in new_doc:
-        del new_doc['signature']
-        removed_fields['top_level'].append('signature')
-    
-    if 'timestamp' in new_doc:  # Should already be gone in v1.1.1, but check anyway
-        del new_doc['timestamp']
-        removed_fields['top_level'].append('timestamp')
-    
-    # Remove meta fields
-    if 'meta' in new_doc and 'x_utc_offset_minutes' in new_doc['meta']:
-        del new_doc['meta']['x_utc_offset_minutes']
-        removed_fields['meta'].append('x_utc_offset_minutes')
-    
-    # Remove x_ fields from meta that are in our removal list
-    meta_x_fields_to_remove = ['x_processed_by', 'x_ai_processing', 'x_statistics', 
-                               'x_migration', 'x_encryption', 'x_merged_from']
-    if 'meta' in new_doc:
-        for field in list(new_doc['meta'].keys()):
-            if field in meta_x_fields_to_remove:
-                del new_doc['meta'][field]
-                removed_fields['meta'].append(field)
-    
-    # Remove entry fields
-    entry_fields_to_remove = ['summary', 'moods', 'tags', 'entities', 'end_date', 
-                              'created_at', 'x_relations', 'x_due_date']
-    
-    for i, entry in enumerate(new_doc.get('entries', [])):
-        removed_fields['entries'][i] = []
-        for field in entry_fields_to_remove:
-            if field in entry:
-                del entry[field]
-                removed_fields['entries'][i].append(field)
+    new_doc, removed_fields = _strip_fields(old_doc)
     
     # Update version
     new_doc['spec_version'] = 'nalt-protocol/1.2.0'
     
     # Add migration metadata as extension field
-    new_doc['x_migrated_at'] = datetime.utcnow().isoformat() + 'Z'
+    new_doc['x_migrated_at'] = _MIGRATED_AT
     
     return new_doc, removed_fields
 
@@ -76,62 +109,129 @@ def summarize_migration(removed_fields):
     if removed_fields['meta']:
         summary.append(f"Meta fields removed: {', '.join(removed_fields['meta'])}")
     
-    # Count entry field removals
-    entry_field_counts = {}
-    for entry_idx, fields in removed_fields['entries'].items():
-        for field in fields:
-            entry_field_counts[field] = entry_field_counts.get(field, 0) + 1
-    
-    if entry_field_counts:
+    # Entry field removals, counted per field during migration
+    if removed_fields['entries']:
         entry_summary = []
-        for field, count in sorted(entry_field_counts.items()):
+        for field, count in sorted(removed_fields['entries'].items()):
             entry_summary.append(f"{field} ({count} entries)")
         summary.append(f"Entry fields removed: {', '.join(entry_summary)}")
     
     return '\n'.join(summary)
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python migrate_v1.1.1_to_v1.2.0.py <input_file.json>")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
+def _dumps(doc):
+    """Serialize a document to indented UTF-8 JSON bytes."""
+    if orjson:
+        try:
+            return orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits; stdlib json keeps them
+            pass
+    return json.dumps(doc, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _output_path(input_file):
+    """Return the path the migrated copy of a file is written to."""
+    base_name = os.path.splitext(input_file)[0]
+    return f"migrated_{os.path.basename(base_name)}.json"
+
+
+def migrate_file(input_file):
+    """
+    Migrate a single file, writing migrated_<name>.json to the current directory.
+    Returns a (success, report) tuple; the report is printed by main().
+    """
+    report = []
     
     # Check if file exists
     if not os.path.exists(input_file):
-        print(f"Error: File '{input_file}' not found.")
-        sys.exit(1)
+        return False, f"Error: File '{input_file}' not found."
     
     # Read the input file
     try:
         with open(input_file, 'r', encoding='utf-8') as f:
+            # stdlib json keeps integers of any size; orjson would turn
+            # integers wider than 64 bits into floats
             old_doc = json.load(f)
     except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in '{input_file}': {e}")
-        sys.exit(1)
+        return False, f"Error: Invalid JSON in '{input_file}': {e}"
+    except (OSError, ValueError) as e:
+        return False, f"Error: Cannot read '{input_file}': {e}"
+    
+    # Report malformed documents as a failed file instead of raising, so that
+    # one bad file does not abort a batch
+    if not isinstance(old_doc, dict):
+        return False, f"Error: '{input_file}' does not contain a JSON object."
     
     # Check version
-    if not old_doc.get('spec_version', '').startswith('nalt-protocol/1.1'):
-        print(f"Warning: Document version is '{old_doc.get('spec_version', 'unknown')}', expected 'nalt-protocol/1.1.x'")
+    spec_version = old_doc.get('spec_version', '')
+    if not (isinstance(spec_version, str) and spec_version.startswith('nalt-protocol/1.1')):
+        report.append(f"Warning: Document version is '{old_doc.get('spec_version', 'unknown')}', expected 'nalt-protocol/1.1.x'")
     
     # Migrate the document
-    new_doc, removed_fields = migrate_document(old_doc)
+    try:
+        new_doc, removed_fields = migrate_document(old_doc)
+    except (AttributeError, TypeError) as e:
+        return False, f"Error: Unexpected document structure in '{input_file}': {e}"
     
     # Generate output filename
-    base_name = os.path.splitext(input_file)[0]
-    output_file = f"migrated_{os.path.basename(base_name)}.json"
+    output_file = _output_path(input_file)
     
     # Write the migrated document
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(new_doc, f, indent=2, ensure_ascii=False)
-    
-    # Print summary
-    print(f"✅ Migration complete: {input_file} → {output_file}")
-    print(f"   Version: {old_doc.get('spec_version', 'unknown')} → {new_doc['spec_version']}")
-    print("\n📊 Migration Summary:")
-    print(summarize_migration(removed_fields))
-    print(f"\n   Output file: {output_file}")
+    # Serialize in one shot and write the encoded bytes with a single call
+    payload = _dumps(new_doc)
+    try:
+        with open(output_file, 'wb') as f:
+            f.write(payload)
+    except OSError as e:
+        return False, f"Error: Cannot write '{output_file}': {e}"
+    
+    # Summary
+    report.append(f"✅ Migration complete: {input_file} → {output_file}")
+    report.append(f"   Version: {old_doc.get('spec_version', 'unknown')} → {new_doc['spec_version']}")
+    report.append("\n📊 Migration Summary:")
+    report.append(summarize_migration(removed_fields))
+    report.append(f"\n   Output file: {output_file}")
+    return True, '\n'.join(report)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python migrate_v1.1.1_to_v1.2.0.py <input_file.json> [<input_file.json> ...]")
+        sys.exit(1)
+    
+    input_files = sys.argv[1:]
+    
+    # Outputs go to the current directory by base name, so inputs such as
+    # a/data.json and b/data.json would overwrite each other; fail them all
+    targets = {}
+    for input_file in input_files:
+        targets.setdefault(os.path.abspath(_output_path(input_file)), []).append(input_file)
+    results = [None] * len(input_files)
+    pending = []
+    for i, input_file in enumerate(input_files):
+        sources = targets[os.path.abspath(_output_path(input_file))]
+        if len(sources) > 1:
+            results[i] = (False, f"Error: Output file '{_output_path(input_file)}' would be written for "
+                                 f"more than one input ({', '.join(sources)}); skipping '{input_file}'.")
+        else:
+            pending.append(i)
+    
+    # Files are independent, so migrate several of them in parallel
+    if len(pending) == 1:
+        results[pending[0]] = migrate_file(input_files[pending[0]])
+    elif pending:
+        with multiprocessing.Pool() as pool:
+            migrated = pool.map(migrate_file, [input_files[i] for i in pending])
+        for i, result in zip(pending, migrated):
+            results[i] = result
+    
+    failed = False
+    for success, report in results:
+        print(report)
+        failed = failed or not success
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,207 @@ import jsonschema
 import sys
 import os
 import argparse
+import functools
+import mmap
+import re
 from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Literal
 
-def validate_nalt_protocol(file_path, version='v1.2.0', check_strongly_recommended=True):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import jsonschema_rs
+except ImportError:
+    jsonschema_rs = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgspec
+    import msgspec.inspect
+except ImportError:
+    msgspec = None
+
+# Preferred backend first: jsonschema-rs, then fastjsonschema, then jsonschema
+if jsonschema_rs:
+    _ValidationError = jsonschema_rs.ValidationError
+elif fastjsonschema:
+    _ValidationError = fastjsonschema.JsonSchemaValueException
+else:
+    _ValidationError = jsonschema.exceptions.ValidationError
+
+if msgspec:
+    # Typed model of schema/v1.2.0/schema.json, checked against that file by
+    # _model_matches_schema() below. Decoding into it checks every constraint of
+    # the schema except "format" (which the schema validators do not check
+    # either), so a valid document is parsed and validated in one pass. Unknown
+    # fields are ignored, as "additionalProperties" allows. Patterns end in \Z
+    # rather than $ because msgspec uses Python's re, whose $ also matches
+    # before a trailing newline (see _DOLLAR below).
+    class MetaV120(msgspec.Struct):
+        language: Annotated[str, msgspec.Meta(pattern=r'^[a-z]{2}\Z')]
+        timezone: str
+
+    class EntryV120(msgspec.Struct):
+        entry_id: str
+        type: Literal['event', 'reflection', 'task', 'idea', 'log']
+        mode: Literal['morning', 'afternoon', 'evening', 'night', 'none']
+        content_format: Literal['text/plain', 'text/markdown', 'text/html',
+                                'application/json', 'text/org']
+        content: str
+
+    class NaltDocumentV120(msgspec.Struct):
+        spec_version: Literal['nalt-protocol/1.2.0']
+        document_id: str
+        date: Annotated[str, msgspec.Meta(pattern=r'^[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')]
+        meta: MetaV120
+        entries: Annotated[list[EntryV120], msgspec.Meta(min_length=1)]
+
+    _TYPED_MODELS = {'v1.2.0': NaltDocumentV120}
+else:
+    _TYPED_MODELS = {}
+
+# Valid mood types (v1.1.0 enforces 20 predefined types)
+VALID_MOODS = frozenset({
+    # Positive moods
+    'happy', 'excited', 'peaceful', 'content', 'grateful',
+    'calm', 'hopeful', 'proud', 'motivated',
+    # Negative moods
+    'sad', 'angry', 'anxious', 'frustrated', 'tired',
+    'confused', 'lonely',
+    # Neutral moods
+    'neutral', 'curious', 'nostalgic', 'surprised'
+})
+
+# Validators compiled from each schema (keyed by version), reused across calls
+_COMPILED = {}
+
+def _read_json(path):
+    """Parse a JSON file from its raw bytes, without decoding to str first."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _schema_path(version):
+    """Return the path of the schema file for the given version."""
+    # Construct the absolute path to the schema file
+    script_dir = os.path.dirname(__file__)
+    return os.path.join(script_dir, f'../../../schema/{version}/schema.json')
+
+@functools.lru_cache(maxsize=8)
+def _load_schema(version):
+    """Load and parse the schema for the given version, once per process."""
+    return _read_json(_schema_path(version))
+
+# An unescaped '$' in a "pattern". JSON Schema patterns follow ECMA-262, where
+# '$' only matches at the very end of the string; jsonschema-rs and
+# fastjsonschema do this, but Python's re also matches before a trailing
+# newline. The jsonschema fallback rewrites '$' to r'\Z' so that every
+# backend rejects values such as "en\n".
+_DOLLAR = re.compile(r'(?<!\\)\$')
+
+def _ecma_pattern(validator, pattern, instance, schema):
+    """jsonschema "pattern" keyword with ECMA-262 end-of-string semantics."""
+    if validator.is_type(instance, 'string') and not re.search(_DOLLAR.sub(r'\\Z', pattern), instance):
+        yield jsonschema.ValidationError(f"{instance!r} does not match {pattern!r}")
+
+def _get_validator(key, schema):
+    """Return a validator callable for schema, compiling it once per cache key."""
+    validator = _COMPILED.get(key)
+    if validator is None:
+        # jsonschema does not check "format" by default; keep the same semantics
+        if jsonschema_rs:
+            validator = jsonschema_rs.validator_for(schema, validate_formats=False).validate
+        elif fastjsonschema:
+            validator = fastjsonschema.compile(schema, use_formats=False)
+        else:
+            cls = jsonschema.validators.validator_for(schema)
+            cls = jsonschema.validators.extend(cls, {'pattern': _ecma_pattern})
+            validator = cls(schema).validate
+        _COMPILED[key] = validator
+    return validator
+
+def _error_path(err):
+    """Return the instance path of a validation error as a list."""
+    if jsonschema_rs:
+        return list(err.instance_path)
+    if fastjsonschema:
+        # fastjsonschema paths start with the name of the root variable ('data')
+        # and hold array indices as strings
+        return [int(p) if p.isdigit() else p for p in err.path[1:]]
+    return list(err.path)
+
+# Schema keywords that _model_matches_schema() knows how to compare; "format"
+# and "description" do not affect validation
+_MODEL_KEYWORDS = frozenset({
+    '$schema', '$defs', '$ref', 'title', 'description', 'format', 'type',
+    'required', 'properties', 'patternProperties', 'additionalProperties',
+    'items', 'minItems', 'maxItems', 'minLength', 'maxLength', 'pattern', 'enum',
+})
+
+def _model_matches_schema(info, schema, root):
+    """
+    Check that a msgspec type (from msgspec.inspect.type_info) enforces the same
+    required fields, enums, patterns and length limits as a schema node. Any
+    keyword the comparison does not know about counts as a mismatch.
+    """
+    if '$ref' in schema:
+        schema = root['$defs'][schema['$ref'].rpartition('/')[2]]
+    if not _MODEL_KEYWORDS.issuperset(schema):
+        return False
+    if isinstance(info, msgspec.inspect.StructType):
+        properties = schema.get('properties', {})
+        return (schema.get('type') == 'object'
+                and schema.get('additionalProperties', True) is True
+                and not info.forbid_unknown_fields
+                and all(extra == {} for extra in schema.get('patternProperties', {}).values())
+                and {f.name for f in info.fields if f.required} == set(schema.get('required', ()))
+                and {f.name for f in info.fields} == set(properties)
+                and all(_model_matches_schema(f.type, properties[f.name], root) for f in info.fields))
+    if isinstance(info, msgspec.inspect.ListType):
+        return (schema.get('type') == 'array'
+                and (info.min_length or 0) == schema.get('minItems', 0)
+                and info.max_length == schema.get('maxItems')
+                and _model_matches_schema(info.item_type, schema.get('items', {}), root))
+    if isinstance(info, msgspec.inspect.LiteralType):
+        if schema.get('type') != 'string':
+            return False
+        if 'enum' in schema:
+            return 'pattern' not in schema and set(info.values) == set(schema['enum'])
+        # A literal standing in for a pattern such as "^nalt-protocol/1\.2\.0$"
+        pattern = _DOLLAR.sub(r'\\Z', schema.get('pattern', ''))
+        return all(re.search(pattern, value) for value in info.values)
+    if isinstance(info, msgspec.inspect.StrType):
+        pattern = schema.get('pattern')
+        return (schema.get('type') == 'string' and 'enum' not in schema
+                and info.pattern == (pattern and _DOLLAR.sub(r'\\Z', pattern))
+                and info.min_length == schema.get('minLength')
+                and info.max_length == schema.get('maxLength'))
+    return False
+
+# Typed decoders, only for the models that still match their schema file;
+# other versions (or a drifted model) are validated against the schema
+_TYPED_DECODERS = {}
+for _version, _model in _TYPED_MODELS.items():
+    try:
+        _schema = _load_schema(_version)
+    except (OSError, ValueError):
+        continue
+    if _model_matches_schema(msgspec.inspect.type_info(_model), _schema, _schema):
+        _TYPED_DECODERS[_version] = msgspec.json.Decoder(_model)
+
+def validate_nalt_protocol(file_path, version='v1.2.0', check_strongly_recommended=True, stream=False):
     """
     Validates a JSON file against the NALT Protocol schema.
     
@@ -13,74 +211,273 @@ def validate_nalt_protocol(file_path, version='v1.2.0', check_strongly_recommend
         file_path: Path to the JSON file to validate
         version: Schema version to validate against (default: v1.2.0)
         check_strongly_recommended: Whether to warn about missing strongly recommended fields
+        stream: Whether to validate entries one at a time as they are parsed (requires ijson)
+    
+    v1.2.0 documents are first decoded straight into a typed msgspec model when
+    msgspec is installed. Documents the model rejects are parsed again and checked
+    against the schema, which stays the authority and reports the error.
     """
-    # Construct the absolute path to the schema file
-    script_dir = os.path.dirname(__file__)
-    schema_path = os.path.join(script_dir, f'../../../schema/{version}/schema.json')
-
     try:
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            schema = json.load(f)
+        schema = _load_schema(version)
     except FileNotFoundError:
-        print(f"Error: Schema file not found at {schema_path}")
+        print(f"Error: Schema file not found at {_schema_path(version)}")
         sys.exit(1)
 
+    # Reject files that cannot be NALT documents before parsing them
+    if not _looks_like_nalt(file_path):
+        print(f"❌ Not a NALT document: '{file_path}' has no spec_version naming nalt-protocol.")
+        sys.exit(2)
+
+    # Check for strongly recommended fields (only for older versions)
+    check_warnings = check_strongly_recommended and version in ['v1.1.0', 'v1.1.1']
+
+    if stream:
+        warnings = _validate_stream(file_path, version, schema, check_warnings)
+    elif version in _TYPED_DECODERS and not check_warnings and _decodes_typed(file_path, _TYPED_DECODERS[version]):
+        warnings = []
+    else:
+        try:
+            instance = _read_json(file_path)
+        except FileNotFoundError:
+            print(f"Error: Data file not found at {file_path}")
+            sys.exit(1)
+        except json.JSONDecodeError:
+            print(f"Error: Invalid JSON in file {file_path}")
+            sys.exit(1)
+
+        try:
+            _get_validator(version, schema)(instance)
+        except _ValidationError as err:
+            _report_failure(file_path, err.message, _error_path(err))
+
+        warnings = check_strongly_recommended_fields(instance) if check_warnings else []
+
+    print(f"✅ Validation successful: '{file_path}' conforms to NALT Protocol {version}.")
+    for warning in warnings:
+        print(f"⚠️  Warning: {warning}")
+
+def _looks_like_nalt(file_path):
+    """
+    Scan the raw bytes of a file for the "spec_version" key and a string value
+    starting with "nalt-protocol". Returns False only when one of them is
+    missing and the file has no backslash, since a JSON escape (e.g.
+    "spec\\u005fversion") can spell either one differently. Passing files may
+    still be invalid. Missing or empty files are left for the parser to report.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'"spec_version"') != -1 and mm.find(b'"nalt-protocol') != -1:
+                    return True
+                return mm.find(b'\\') != -1
+    except (OSError, ValueError):
+        return True
+
+def _report_failure(file_path, message, path):
+    """Print validation error details and exit."""
+    print(f"❌ Validation failed: '{file_path}' does not conform to the schema.")
+    print("Error details:")
+    print(f"  Message: {message}")
+    print(f"  Path: {path}")
+    sys.exit(1)
+
+def _decodes_typed(file_path, decoder):
+    """
+    Return whether a JSON file decodes into a typed msgspec model. Unreadable,
+    malformed and invalid files return False, leaving them for the schema
+    validator to report: msgspec checks every occurrence of a repeated key,
+    while the schema validators only see the last one.
+    """
+    try:
+        decoder.decode(Path(file_path).read_bytes())
+    except (OSError, msgspec.DecodeError):
+        return False
+    return True
+
+def _split_schema(schema):
+    """
+    Split a document schema for streaming validation.
+    
+    Returns:
+        Tuple of (envelope schema, single-entry schema, minimum entry count).
+        The envelope schema only checks that 'entries' is an array.
+    """
+    entries_schema = schema['properties']['entries']
+    envelope_schema = dict(schema, properties=dict(schema['properties'], entries={'type': 'array'}))
+    entry_schema = {k: v for k, v in schema.items() if k in ('$schema', '$defs')}
+    entry_schema.update(entries_schema['items'])
+    return envelope_schema, entry_schema, entries_schema.get('minItems', 0)
+
+def _start_value(event, value):
+    """Return an ObjectBuilder for a container event, or None for a scalar."""
+    if event in ('start_map', 'start_array'):
+        builder = ijson.ObjectBuilder()
+        builder.event(event, value)
+        return builder
+    return None
+
+def _stream_document(f, backend):
+    """
+    Parse a NALT document incrementally from a binary file with an ijson backend.
+    
+    Yields ('entry', entry) for each item of the top-level 'entries' array as
+    soon as it is complete, then ('envelope', document) where the document
+    holds every other top-level field and an empty 'entries' list. A root that
+    is not an object, or an 'entries' value that is not an array, is kept as-is
+    so that schema validation reports it.
+    """
+    events = backend.parse(f, use_float=True)
+    _, event, value = next(events)
+    if event != 'start_map':
+        builder = _start_value(event, value)
+        if builder is None:
+            yield 'envelope', value
+            return
+        for _, event, value in events:
+            builder.event(event, value)
+        yield 'envelope', builder.value
+        return
+
+    envelope = {}
+    key = None
+    in_entries = False
+    builder = None
+    depth = 0
+    for _, event, value in events:
+        if builder is not None:
+            # Inside a top-level field or an entry; feed it until it closes
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            if depth == 0:
+                if in_entries:
+                    yield 'entry', builder.value
+                else:
+                    envelope[key] = builder.value
+                builder = None
+        elif in_entries and event == 'end_array':
+            in_entries = False
+        elif not in_entries and event == 'map_key':
+            key = value
+        elif not in_entries and event == 'end_map':
+            # Read on to the end so that ijson rejects data after the root object
+            for _ in events:
+                pass
+        elif not in_entries and key == 'entries' and event == 'start_array':
+            envelope['entries'] = []
+            in_entries = True
+        else:
+            builder = _start_value(event, value)
+            depth = 1
+            if builder is None:
+                if in_entries:
+                    yield 'entry', value
+                else:
+                    envelope[key] = value
+    yield 'envelope', envelope
+
+def _stream_entries(file_path, backend, validate_entry, check_warnings):
+    """
+    Validate each entry of a JSON file as it is parsed.
+    
+    Returns:
+        Tuple of (envelope, entry count, warnings)
+    """
+    warnings = []
+    count = 0
+    envelope = None
+    with open(file_path, 'rb') as f:
+        for kind, value in _stream_document(f, backend):
+            if kind == 'envelope':
+                envelope = value
+                continue
+            try:
+                validate_entry(value)
+            except _ValidationError as err:
+                _report_failure(file_path, err.message, ['entries', count] + _error_path(err))
+            if check_warnings:
+                warnings.extend(check_strongly_recommended_fields({'entries': [value]}))
+            count += 1
+    return envelope, count, warnings
+
+def _validate_stream(file_path, version, schema, check_warnings):
+    """
+    Validate a JSON file entry by entry without loading it into memory whole.
+    
+    Args:
+        file_path: Path to the JSON file to validate
+        version: Schema version, used as the cache key for compiled validators
+        schema: Parsed document schema
+        check_warnings: Whether to collect strongly recommended field warnings
+    
+    Returns:
+        List of warnings
+    """
+    if ijson is None:
+        print("Error: --stream requires the ijson package (pip install ijson)")
+        sys.exit(1)
+
+    envelope_schema, entry_schema, min_entries = _split_schema(schema)
+    validate_envelope = _get_validator((version, 'envelope'), envelope_schema)
+    validate_entry = _get_validator((version, 'entry'), entry_schema)
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            instance = json.load(f)
+        try:
+            envelope, count, warnings = _stream_entries(file_path, ijson, validate_entry, check_warnings)
+        except ijson.JSONError as err:
+            # The yajl-based backends reject integers wider than 64 bits, which
+            # the default path accepts; re-read such files with the Python backend
+            if ijson.backend_name == 'python' or 'integer overflow' not in str(err):
+                raise
+            envelope, count, warnings = _stream_entries(
+                file_path, ijson.get_backend('python'), validate_entry, check_warnings)
     except FileNotFoundError:
         print(f"Error: Data file not found at {file_path}")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         print(f"Error: Invalid JSON in file {file_path}")
         sys.exit(1)
 
     try:
-        jsonschema.validate(instance=instance, schema=schema)
-        print(f"✅ Validation successful: '{file_path}' conforms to NALT Protocol {version}.")
-        
-        # Check for strongly recommended fields (only for older versions)
-        if check_strongly_recommended and version in ['v1.1.0', 'v1.1.1']:
-            warnings = check_strongly_recommended_fields(instance)
-            for warning in warnings:
-                print(f"⚠️  Warning: {warning}")
-    except jsonschema.exceptions.ValidationError as err:
-        print(f"❌ Validation failed: '{file_path}' does not conform to the schema.")
-        print("Error details:")
-        print(f"  Message: {err.message}")
-        print(f"  Path: {list(err.path)}")
-        sys.exit(1)
+        validate_envelope(envelope)
+    except _ValidationError as err:
+        _report_failure(file_path, err.message, _error_path(err))
+
+    if count < min_entries:
+        _report_failure(file_path, f"entries must contain at least {min_entries} item(s)", ['entries'])
+
+    return warnings
 
 def check_strongly_recommended_fields(instance):
     """Check for strongly recommended fields and return warnings."""
     warnings = []
     
-    # Check mood intensity precision
-    for entry in instance.get('entries', []):
-        if 'moods' in entry:
-            for i, mood in enumerate(entry['moods']):
-                intensity = mood.get('intensity', 0)
-                if intensity != round(intensity, 2):
-                    warnings.append(f"Mood intensity should use 0.01 precision (entry {i})")
+    # Nothing to check without entries
+    entries = instance.get('entries')
+    if not entries:
+        return warnings
     
-    # Check for valid mood types (v1.1.0 enforces 20 predefined types)
-    valid_moods = {
-        # Positive moods
-        'happy', 'excited', 'peaceful', 'content', 'grateful', 
-        'calm', 'hopeful', 'proud', 'motivated',
-        # Negative moods
-        'sad', 'angry', 'anxious', 'frustrated', 'tired', 
-        'confused', 'lonely',
-        # Neutral moods
-        'neutral', 'curious', 'nostalgic', 'surprised'
-    }
-    for entry in instance.get('entries', []):
-        if 'moods' in entry:
-            for mood in entry['moods']:
-                mood_type = mood.get('type', '')
-                if mood_type and mood_type not in valid_moods:
-                    warnings.append(f"Mood type '{mood_type}' is not in the list of 20 predefined mood types")
-                    break
+    # Check mood intensity precision and mood types in a single pass
+    for entry in entries:
+        moods = entry.get('moods')
+        if not moods:
+            continue
+        type_warned = False
+        for i, mood in enumerate(moods):
+            intensity = mood.get('intensity', 0)
+            # Most 0.01 multiples pass the cheap is_integer() test; the few it
+            # rejects through float error (0.29 * 100 == 28.999999999999996)
+            # fall back to round(). Integers are always precise enough.
+            if (isinstance(intensity, float) and not (intensity * 100).is_integer()
+                    and intensity != round(intensity, 2)):
+                warnings.append(f"Mood intensity should use 0.01 precision (entry {i})")
+            # Report at most one unknown mood type per entry
+            mood_type = mood.get('type', '')
+            if not type_warned and mood_type and mood_type not in VALID_MOODS:
+                warnings.append(f"Mood type '{mood_type}' is not in the list of 20 predefined mood types")
+                type_warned = True
     
     return warnings
 
@@ -101,7 +498,8 @@ if __name__ == "__main__":
     parser.add_argument('file', help='Path to JSON file to validate')
     parser.add_argument('--version', default='v1.2.0', help='Schema version (default: v1.2.0)')
     parser.add_argument('--no-warnings', action='store_true', help='Disable strongly recommended field warnings')
+    parser.add_argument('--stream', action='store_true', help='Validate entries incrementally to bound memory on large files (requires ijson)')
     
     args = parser.parse_args()
     
-    validate_nalt_protocol(args.file, args.version, not args.no_warnings)
\ No newline at end of file
+    validate_nalt_protocol(args.file, args.version, not args.no_warnings, args.stream)
\ No newline at end of file